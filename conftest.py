@@ -1,6 +1,26 @@
 import os
 
 import pytest
+
+
+# --- pytest-xdist support --- #
+# Each xdist worker is a separate process; give every worker its own SQLite
+# files so parallel runs (`pytest -n auto`) never share, lock or delete each
+# other's databases. Without xdist the names are unchanged.
+_XDIST_WORKER = os.getenv("PYTEST_XDIST_WORKER")
+
+
+def _worker_db_url(url: str) -> str:
+    if not _XDIST_WORKER or not url.endswith(".db"):
+        return url
+    return f"{url[:-3]}-{_XDIST_WORKER}.db"
+
+
+# Must run before `main`/`database` are imported, since the app engine is
+# created at import time from DATABASE_URL (also read by alembic/env.py).
+os.environ["DATABASE_URL"] = _worker_db_url(
+    os.getenv("DATABASE_URL", "sqlite:///./test_job_assistant_poc.db")
+)
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
@@ -14,9 +34,9 @@ from alembic import command
 from main import app, get_db
 
 # Import database components needed for setup
-from database import Base
+from database import Base, engine as app_engine
 
-TEST_DATABASE_URL = "sqlite:///./great-fit-test.db"
+TEST_DATABASE_URL = _worker_db_url("sqlite:///./great-fit-test.db")
 
 connect_args = (
     {"check_same_thread": False} if TEST_DATABASE_URL.startswith("sqlite") else {}
@@ -39,6 +59,10 @@ def setup_test_database():
     print(f"Creating test database tables from models at {db_path}")
     # --- Create schema directly from models --- #
     Base.metadata.create_all(bind=test_engine)
+    # The app now creates its tables in the lifespan, which only runs inside a
+    # TestClient context; code that falls back to the app's own SessionLocal
+    # (e.g. background tasks called without a session override) needs them too.
+    Base.metadata.create_all(bind=app_engine)
     # --- End schema creation --- #
 
     print("Stamping database with Alembic head revision")
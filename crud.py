@@ -1,4 +1,6 @@
 import json
+from typing import Optional
+
 from sqlalchemy.orm import Session
 
 import models
@@ -8,7 +10,7 @@ import schemas
 # --- User CRUD ---
 def get_user_by_id(db: Session, user_id: int):
     """Get a user by their primary key ID."""
-    return db.query(models.User).filter(models.User.id == user_id).first()
+    return db.get(models.User, user_id)
 
 
 def get_user_by_email(db: Session, email: str):
@@ -32,7 +34,7 @@ def create_user(db: Session, user: schemas.UserCreate):
 
 # --- User Profile CRUD ---
 def get_user_profile(db: Session, user_id: int):
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = db.get(models.User, user_id)
     if user:
         return user.profile_json  # Returns the raw JSON string
     return None
@@ -41,11 +43,15 @@ def get_user_profile(db: Session, user_id: int):
 def create_or_update_user_profile(
     db: Session, user_id: int, profile: schemas.UserProfileCreate
 ):
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = db.get(models.User, user_id)
     if not user:
         return None
 
-    profile_json_string = json.dumps(profile.profile_data)
+    # Stored compact and unescaped: this string is sent verbatim in ranking
+    # and tailoring prompts, where spaces and \uXXXX escapes cost tokens.
+    profile_json_string = json.dumps(
+        profile.profile_data, separators=(",", ":"), ensure_ascii=False
+    )
     user.profile_json = profile_json_string
     db.add(user)  # add works for updates too
     db.commit()  # Explicitly commit the transaction to ensure it's saved to the database
@@ -54,6 +60,20 @@ def create_or_update_user_profile(
     return user.profile_json
 
 
+# --- LLM Response Cache CRUD ---
+def get_llm_response(db: Session, key: str):
+    """Returns the stored response JSON for a cache key, or None."""
+    row = db.get(models.LLMResponseCache, key)
+    return row.response_json if row else None
+
+
+def save_llm_response(db: Session, key: str, response_json: str):
+    """Stores the response JSON for a cache key, replacing any existing row."""
+    db_row = db.merge(models.LLMResponseCache(key=key, response_json=response_json))
+    db.commit()
+    return db_row
+
+
 # --- Job CRUD ---
 def create_job(db: Session, job: schemas.JobCreate, user_id: int):
     """Creates a new job entry associated with a user, using ranking_score and ranking_explanation only."""
@@ -71,9 +91,18 @@ def create_job(db: Session, job: schemas.JobCreate, user_id: int):
     return db_job
 
 
-def get_jobs_for_user(db: Session, user_id: int):
-    """Retrieves all jobs for a specific user."""
-    return db.query(models.Job).filter(models.Job.owner_id == user_id).order_by(models.Job.created_at.desc()).all()
+def get_jobs_for_user(
+    db: Session, user_id: int, limit: Optional[int] = None, offset: int = 0
+):
+    """Retrieves a user's jobs, newest first; all of them unless `limit` is given."""
+    return (
+        db.query(models.Job)
+        .filter(models.Job.owner_id == user_id)
+        .order_by(models.Job.created_at.desc())
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
 
 
 def get_job(db: Session, job_id: int, user_id: int):
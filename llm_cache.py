@@ -0,0 +1,273 @@
+"""Response cache and single-flight for LLM calls.
+
+`cache_llm_response` memoizes an async LLM call on a canonical hash of its
+arguments, in memory and optionally in the database; the `*_cached` handles
+below are the shared, cached entry points used by the rest of the app.
+"""
+import asyncio
+import functools
+import hashlib
+import re
+import unicodedata
+from typing import Any, get_type_hints
+
+import orjson
+import structlog
+from cachetools import TTLCache
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+import crud
+from database import SessionLocal
+import llm_interaction
+from llm_interaction import (
+    call_llm_for_job_ranking,
+    call_llm_for_resume_tailoring,
+    call_llm_for_resume_parsing,
+    call_llm_to_clean_job_description,
+)
+from settings import get_settings
+
+logger = structlog.get_logger(__name__)
+
+# Bump to invalidate every cached and persisted LLM result after a change the
+# fingerprint below can't see, e.g. how a user prompt is assembled.
+CACHE_VERSION = 1
+
+# LLM response cache to reduce API calls. Bounded (least recently used entries
+# are evicted first) and time-limited so a long-running process doesn't keep
+# every resume/job ever processed in memory.
+_LLM_CACHE: TTLCache = TTLCache(
+    maxsize=get_settings().llm_cache_max_entries,
+    ttl=get_settings().llm_cache_ttl_seconds,
+)
+# Futures for LLM calls currently in progress, by cache key. Concurrent callers
+# with the same key await the first caller's result instead of issuing
+# duplicate (paid) requests.
+_INFLIGHT: dict[str, asyncio.Future] = {}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _canonical_text(text: str) -> str:
+    """Normalize text so formatting-only variants share a cache key.
+
+    Re-pasted resumes and scraped job postings routinely differ only in
+    Unicode composition, line breaks, indentation or trailing spaces, none of
+    which change the LLM's answer.
+    """
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def _canonical_json(value: Any) -> bytes:
+    # orjson emits compact UTF-8 bytes directly, avoiding json.dumps' Python
+    # encoder and the extra str -> bytes copy on large profile payloads.
+    return orjson.dumps(
+        value,
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+    )
+
+
+def _hash_part(digest, value: Any) -> None:
+    """Feed one type-tagged, length-prefixed value into the cache-key digest.
+
+    Structured values are hashed as canonical JSON (sorted keys, no spaces) so
+    the key doesn't depend on dict ordering or `repr` details. The type tag
+    keeps "1" and 1 apart; length-prefixing keeps ("ab", "c") and ("a", "bc")
+    apart without joining everything into one big delimited string first.
+    Database sessions never affect an LLM answer and their `repr` differs per
+    request, so they contribute only their position.
+    """
+    if isinstance(value, Session):
+        tag, data = b"d", b""
+    elif isinstance(value, str):
+        tag, data = b"s", _canonical_text(value).encode()
+    elif isinstance(value, BaseModel):
+        tag, data = b"j", _canonical_json(value.model_dump(mode="json"))
+    elif isinstance(value, (dict, list, tuple)):
+        tag, data = b"j", _canonical_json(value)
+    else:
+        tag, data = b"r", repr(value).encode()
+    digest.update(tag)
+    digest.update(len(data).to_bytes(8, "little"))
+    digest.update(data)
+
+
+def _fingerprint() -> str:
+    """Hash of the non-argument inputs that shape every LLM answer.
+
+    Changing a model, a request option such as the seed, a system prompt or
+    the schema of a cached function's return model changes the fingerprint,
+    so results produced under the old settings are never served for the new
+    ones.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for part in (
+        CACHE_VERSION,
+        llm_interaction.MODEL_CONFIG,
+        llm_interaction.COMMON_OPTS,
+        llm_interaction.RESUME_PARSE_SYSTEM_PROMPT,
+        llm_interaction.JD_CLEAN_SYSTEM_PROMPT,
+        llm_interaction.JOB_RANK_SYSTEM_PROMPT,
+        llm_interaction.JOB_RANK_USER_PREAMBLE,
+        llm_interaction.RESUME_TAILOR_SYSTEM_PROMPT,
+    ):
+        _hash_part(digest, part)
+    for func in (
+        call_llm_for_job_ranking,
+        call_llm_for_resume_tailoring,
+        call_llm_for_resume_parsing,
+        call_llm_to_clean_job_description,
+    ):
+        return_type = get_type_hints(func).get("return", Any)
+        _hash_part(digest, TypeAdapter(return_type).json_schema())
+    return digest.hexdigest()
+
+
+CACHE_FINGERPRINT = _fingerprint()
+
+
+def _make_cache_key(func_name: str, args: tuple, kwargs: dict) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    _hash_part(digest, CACHE_FINGERPRINT)
+    _hash_part(digest, func_name)
+    for arg in args:
+        _hash_part(digest, arg)
+    for name in sorted(kwargs):
+        _hash_part(digest, name)
+        _hash_part(digest, kwargs[name])
+    return digest.hexdigest()
+
+
+def _load_persisted(cache_key: str, adapter: TypeAdapter) -> Any:
+    # Like persisting, reading is best effort: if the DB is unavailable,
+    # fall back to calling the LLM rather than failing the call.
+    try:
+        with SessionLocal() as db:
+            stored = crud.get_llm_response(db, cache_key)
+    except SQLAlchemyError:
+        logger.warning(
+            "Failed to load persisted LLM response", key=cache_key[:8], exc_info=True
+        )
+        return None
+    if stored is None:
+        return None
+    try:
+        return adapter.validate_json(stored)
+    except ValidationError:
+        # Stored under rules the model no longer accepts; treat it as a miss
+        # so the fresh answer overwrites it.
+        logger.warning("Discarding invalid persisted LLM response", key=cache_key[:8])
+        return None
+
+
+def _store_persisted(cache_key: str, response_json: str) -> None:
+    # Persisting is best effort: the (paid) result is already in hand, so a
+    # DB error such as a lock timeout or a concurrent insert must not fail
+    # the call.
+    with SessionLocal() as db:
+        try:
+            crud.save_llm_response(db, cache_key, response_json)
+        except SQLAlchemyError:
+            db.rollback()
+            logger.warning(
+                "Failed to persist LLM response", key=cache_key[:8], exc_info=True
+            )
+
+
+def cache_llm_response(func=None, *, persist: bool = False):
+    """Decorator to cache LLM responses based on function parameters
+
+    Arguments should be values (strings, numbers, dicts/lists, Pydantic
+    models); a SQLAlchemy `Session` argument is ignored for the key. Other
+    objects fall back to their `repr`, which only hits if it is stable.
+
+    With `persist=True`, results are also stored in the database as a second
+    tier behind the in-memory cache, so they survive restarts and are shared
+    between workers. Persisted results are rebuilt from the function's return
+    annotation.
+    """
+    if func is None:
+        return functools.partial(cache_llm_response, persist=persist)
+
+    if persist:
+        adapter = TypeAdapter(get_type_hints(func).get("return", Any))
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        # Create a unique key based on function name and all arguments
+        cache_key = _make_cache_key(func.__name__, args, kwargs)
+
+        # Check if we have a cached response
+        if cache_key in _LLM_CACHE:
+            logger.info(
+                "Using cached LLM response", func=func.__name__, key=cache_key[:8]
+            )
+            return _LLM_CACHE[cache_key]
+
+        # Join an identical call that is already in flight
+        while (inflight := _INFLIGHT.get(cache_key)) is not None:
+            logger.info(
+                "Awaiting in-flight LLM call", func=func.__name__, key=cache_key[:8]
+            )
+            try:
+                # Shield so a cancelled waiter doesn't cancel the shared call
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # Only the leader was cancelled, not this caller: its entry
+                # is already gone, so make the call ourselves (or join the
+                # next leader) instead of failing an unrelated request.
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        _INFLIGHT[cache_key] = future
+        try:
+            result = None
+            if persist:
+                result = await asyncio.to_thread(_load_persisted, cache_key, adapter)
+            if result is not None:
+                logger.info(
+                    "Using persisted LLM response", func=func.__name__, key=cache_key[:8]
+                )
+            else:
+                # Call the LLM function
+                result = await func(*args, **kwargs)
+                if persist and result is not None:
+                    await asyncio.to_thread(
+                        _store_persisted,
+                        cache_key,
+                        adapter.dump_json(result).decode(),
+                    )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # Mark retrieved; the caller re-raises it below
+            raise
+        else:
+            # Cache the result
+            if result is not None:
+                _LLM_CACHE[cache_key] = result
+            future.set_result(result)
+            return result
+        finally:
+            _INFLIGHT.pop(cache_key, None)
+
+    return wrapper
+
+
+# Apply caching to all LLM functions
+call_llm_for_job_ranking_cached = cache_llm_response(
+    call_llm_for_job_ranking, persist=True
+)
+call_llm_for_resume_tailoring_cached = cache_llm_response(
+    call_llm_for_resume_tailoring, persist=True
+)
+call_llm_for_resume_parsing_cached = cache_llm_response(call_llm_for_resume_parsing)
+call_llm_to_clean_job_description_cached = cache_llm_response(
+    call_llm_to_clean_job_description, persist=True
+)
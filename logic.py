@@ -1,20 +1,17 @@
-import hashlib
-import functools
 import structlog
 from sqlalchemy.orm import Session
-from typing import Any, Union
+from typing import Any, Optional, Union
 import fastapi
 import schemas
 import models
-import json
 
 # Project imports
-from llm_interaction import (
-    call_llm_for_job_ranking,
-    call_llm_for_resume_tailoring,
-    call_llm_for_resume_parsing,
-    call_llm_to_clean_job_description,
+from llm_cache import (
+    call_llm_for_job_ranking_cached,
+    call_llm_for_resume_tailoring_cached,
+    call_llm_to_clean_job_description_cached,
 )
+from llm_interaction import call_llm_for_resume_parsing
 import crud
 
 # Set up logging
@@ -22,6 +19,15 @@ logger = structlog.get_logger(__name__)
 
 # ---------------------------------------------------------------------------
 
+async def clean_job_description(
+    raw_markdown: str,
+) -> Union[schemas.CleanedJobDescription, None]:
+    """Cleans job description markdown using a cached LLM call."""
+    logger.info("Attempting to clean job description using cached LLM call.")
+    cleaned_data = await call_llm_to_clean_job_description_cached(raw_markdown)
+    return cleaned_data
+
+
 async def parse_job_description_with_llm(raw_description: str) -> schemas.CleanedJobDescription:
     """
     Extract `title`, `company`, and `description` from an unstructured job posting.
@@ -33,8 +39,7 @@ async def parse_job_description_with_llm(raw_description: str) -> schemas.Cleane
     ------
     fastapi.HTTPException      • if any required field is missing
     """
-    # Clean job description using LLM parse endpoint
-    cleaned = await call_llm_to_clean_job_description_cached(raw_description)
+    cleaned = await clean_job_description(raw_description)
     if not cleaned or not (cleaned.title and cleaned.company and cleaned.cleaned_markdown):
         raise fastapi.HTTPException(
             status_code=422,
@@ -42,60 +47,23 @@ async def parse_job_description_with_llm(raw_description: str) -> schemas.Cleane
         )
     return cleaned
 
-# Simple LLM response cache to reduce API calls
-_LLM_CACHE = {}
-
-
-def cache_llm_response(func):
-    """Decorator to cache LLM responses based on function parameters"""
-
-    @functools.wraps(func)
-    async def wrapper(*args, **kwargs):
-        # Create a unique key based on function name and all arguments
-        # Convert all args to strings for hashing
-        args_str = [str(arg) for arg in args]
-        kwargs_str = [f"{k}={v}" for k, v in sorted(kwargs.items())]
-        all_args = func.__name__ + "|" + "|".join(args_str + kwargs_str)
-        cache_key = hashlib.md5(all_args.encode()).hexdigest()
-
-        # Check if we have a cached response
-        if cache_key in _LLM_CACHE:
-            logger.info(
-                f"Using cached LLM response for {func.__name__}, hash {cache_key[:8]}"
-            )
-            return _LLM_CACHE[cache_key]
-
-        # Call the LLM function
-        result = await func(*args, **kwargs)
-
-        # Cache the result
-        if result is not None:
-            _LLM_CACHE[cache_key] = result
-
-        return result
 
-    return wrapper
+async def rank_job_description(
+    job_description: str, profile_text: Optional[str]
+) -> tuple[float, str]:
+    """Ranks a job description against a profile without touching the DB."""
+    result = await call_llm_for_job_ranking_cached(job_description, profile_text)
+    return result.score, result.explanation
 
 
-# Apply caching to all LLM functions
-call_llm_for_job_ranking_cached = cache_llm_response(call_llm_for_job_ranking)
-call_llm_for_resume_tailoring_cached = cache_llm_response(call_llm_for_resume_tailoring)
-call_llm_for_resume_parsing_cached = cache_llm_response(call_llm_for_resume_parsing)
-call_llm_to_clean_job_description_cached = cache_llm_response(
-    call_llm_to_clean_job_description
-)
-
-
-async def clean_job_description(
-    raw_markdown: str,
-) -> Union[schemas.CleanedJobDescription, None]:
-    """Cleans job description markdown using a cached LLM call."""
-    logger.info("Attempting to clean job description using cached LLM call.")
-    cleaned_data = await call_llm_to_clean_job_description_cached(raw_markdown)
-    return cleaned_data
+async def rank_job_with_llm(
+    db: Session, job_id: int, user_id: int, profile_text: Optional[str] = None
+):
+    """Ranks a job against the user's profile and stores the result.
 
-
-async def rank_job_with_llm(db: Session, job_id: int, user_id: int):
+    Callers that already hold the profile JSON can pass it as `profile_text`
+    to skip reloading it.
+    """
     logger.info("Ranking job", job_id=job_id, user_id=user_id)
 
     db_job = crud.get_job(db, job_id=job_id, user_id=user_id)
@@ -103,14 +71,12 @@ async def rank_job_with_llm(db: Session, job_id: int, user_id: int):
         logger.error("Job not found for user", job_id=job_id, user_id=user_id)
         return None, None
 
-    profile_json_string = crud.get_user_profile(db, user_id=user_id)
-    job_description_text = db_job.description
-
-    result = await call_llm_for_job_ranking_cached(
-        job_description_text, profile_json_string
+    profile_json_string = profile_text
+    if profile_json_string is None:
+        profile_json_string = crud.get_user_profile(db, user_id=user_id)
+    score, explanation = await rank_job_description(
+        db_job.description, profile_json_string
     )
-    score = result.score
-    explanation = result.explanation
 
     updated_job = crud.update_job_ranking(
         db, job_id=job_id, user_id=user_id, score=score, explanation=explanation
@@ -139,17 +105,21 @@ async def parse_resume_with_llm(resume_text: str) -> dict[str, Any]:
     return parsed_data.model_dump()
 
 
-async def generate_tailoring_suggestions(job: models.Job, db: Session) -> Union[str, None]:
-    """Fetches user profile and generates tailoring suggestions for a given job."""
+async def generate_tailoring_suggestions(
+    job: models.Job, db: Session, profile_text: Optional[str] = None
+) -> Union[str, None]:
+    """Fetches user profile and generates tailoring suggestions for a given job.
+
+    Pass `profile_text` when the caller has already loaded the profile JSON.
+    """
     if not job.owner_id:
-        print(f"Error: Job {job.id} has no associated owner_id.")
+        logger.error("Job has no associated owner_id", job_id=job.id)
         return None
 
-    profile_json_string = crud.get_user_profile(db, user_id=job.owner_id)
-
-    # Parse the profile JSON string and extract profile text
-    profile_data = json.loads(profile_json_string)
-    profile_text = json.dumps(profile_data, indent=2)
+    # The stored profile is already JSON; send it as-is rather than parsing
+    # and re-indenting it (which also inflated the prompt's token count).
+    if profile_text is None:
+        profile_text = crud.get_user_profile(db, user_id=job.owner_id)
 
     # Include ranking explanation if available to provide additional context
     ranking_context = ""
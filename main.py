@@ -1,8 +1,10 @@
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+import functools
+import hashlib
+import multiprocessing
 from typing import List, Optional, Union
-import json
-import os
-import tempfile
 import logging
 
 from fastapi.responses import RedirectResponse
@@ -15,6 +17,8 @@ from fastapi import (
     Request,
     Header,
     Body,
+    BackgroundTasks,
+    Query,
     status,
 )
 from fastapi.middleware.cors import CORSMiddleware
@@ -23,8 +27,7 @@ from fastapi.responses import JSONResponse, Response, HTMLResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-import fitz
-from docx import Document
+import orjson
 from sse_starlette.sse import EventSourceResponse
 import openai
 import stripe
@@ -35,7 +38,9 @@ from aws_embedded_metrics import metric_scope
 import models
 import schemas
 import crud
+import llm_interaction
 import logic
+import resume_text
 from database import SessionLocal, create_db_and_tables, get_db
 from auth import get_current_user, verify_token
 from settings import get_settings, Settings
@@ -47,20 +52,41 @@ from observability import init_observability
 init_observability()
 logger = structlog.get_logger(__name__)
 
-# Create DB tables on startup
-create_db_and_tables()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create DB tables on startup, unless schema is managed externally
+    if get_settings().init_db:
+        await asyncio.to_thread(create_db_and_tables)
+    yield
+    if get_resume_parse_pool.cache_info().currsize:
+        get_resume_parse_pool().shutdown(cancel_futures=True)
+    # Close the shared OpenRouter client's pooled connections, if one was made
+    if llm_interaction.get_client.cache_info().currsize:
+        await llm_interaction.get_client().close()
+
 
 app = FastAPI(
     title="Great Fit",
     description="Backend API for Great Fit job application assistant",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
-# Semaphore to limit concurrent database writes for SQLite
-db_write_semaphore = asyncio.Semaphore(1)
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson, for endpoints that build their own
+    response content. Routes with a `response_model` are left on FastAPI's
+    default class, which already serializes them straight to bytes via
+    Pydantic. (FastAPI's own ORJSONResponse is deprecated.)
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
 
 # --- CORS Middleware ---
 origins = [
@@ -90,6 +116,10 @@ templates = Jinja2Templates(directory="templates")
 
 # --- SSE Connection Manager (Simple In-Memory) --- #
 class ConnectionManager:
+    # Per-connection event backlog. A stalled client can't grow its queue past
+    # this; the oldest pending events are dropped first.
+    max_queued_events = 256
+
     def __init__(self):
         # Dictionary to hold asyncio Queues for each user_id
         self.active_connections: dict[int, asyncio.Queue] = {}
@@ -97,7 +127,7 @@ class ConnectionManager:
 
     async def connect(self, user_id: int) -> asyncio.Queue:
         """Registers a new user connection and returns their queue."""
-        queue = asyncio.Queue()
+        queue = asyncio.Queue(maxsize=self.max_queued_events)
         self.active_connections[user_id] = queue
         logger.info("SSE connection established", user_id=user_id)
         return queue
@@ -108,6 +138,13 @@ class ConnectionManager:
             del self.active_connections[user_id]
             logger.info("SSE connection closed", user_id=user_id)
 
+    def _enqueue(self, user_id: int, item: dict) -> None:
+        queue = self.active_connections[user_id]
+        if queue.full():
+            queue.get_nowait()
+            logger.warning("SSE queue full; dropped oldest event", user_id=user_id)
+        queue.put_nowait(item)
+
     async def send_personal_message(
         self, message: Union[str, dict], user_id: int, event: str = "message"
     ) -> None:
@@ -118,12 +155,10 @@ class ConnectionManager:
                     req_id = get_contextvars().get("request_id")
                     if req_id:
                         message["request_id"] = req_id
-                json_data = json.dumps(message)
+                json_data = orjson.dumps(message).decode()
             else:
                 json_data = message
-            await self.active_connections[user_id].put(
-                {"event": event, "data": json_data}
-            )
+            self._enqueue(user_id, {"event": event, "data": json_data})
             logger.info("Sent SSE event", sse_event=event, user_id=user_id)
         else:
             logger.warning("Attempted to send SSE to disconnected user", user_id=user_id)
@@ -132,11 +167,12 @@ class ConnectionManager:
         if user_id in self.active_connections:
             self.processing_counts[user_id] = self.processing_counts.get(user_id, 0) + 1
             count = self.processing_counts[user_id]
-            await self.active_connections[user_id].put(
+            self._enqueue(
+                user_id,
                 {
                     "event": "processing_count_update",
-                    "data": json.dumps({"count": count}),
-                }
+                    "data": orjson.dumps({"count": count}).decode(),
+                },
             )
             logger.info("Incremented processing count", user_id=user_id, count=count)
 
@@ -147,11 +183,12 @@ class ConnectionManager:
         ):
             self.processing_counts[user_id] -= 1
             count = self.processing_counts[user_id]
-            await self.active_connections[user_id].put(
+            self._enqueue(
+                user_id,
                 {
                     "event": "processing_count_update",
-                    "data": json.dumps({"count": count}),
-                }
+                    "data": orjson.dumps({"count": count}).decode(),
+                },
             )
             logger.info("Decremented processing count", user_id=user_id, count=count)
         elif user_id in self.processing_counts and self.processing_counts[user_id] <= 0:
@@ -213,45 +250,53 @@ def get_me(current_user: models.User = Depends(get_current_user)):
 
 
 # --- Helper Functions for Resume Processing ---
+_RESUME_CONTENT_TYPES = {
+    resume_text.PDF_CONTENT_TYPE,
+    *resume_text.DOCX_CONTENT_TYPES,
+    "text/plain",
+}
+
+
+@functools.lru_cache(maxsize=1)
+def get_resume_parse_pool() -> ProcessPoolExecutor:
+    """Process pool for PDF/DOCX parsing, created on first use.
+
+    Workers are spawned rather than forked, so they start clean instead of
+    inheriting the server's threads and connections. When the app is served
+    with `uvicorn main:app` they import resume_text, not the app; under
+    `python main.py`, spawn re-imports this module as `__mp_main__` in each
+    worker, building the whole app there (but not starting a server).
+    """
+    return ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+
+
 async def extract_text_from_resume(file: UploadFile) -> str:
     """Extract text from various resume formats (PDF, DOCX, TXT)"""
     content_type = file.content_type
-    file_content = await file.read()
-    extracted_text = ""
-
-    if content_type == "application/pdf":
-        # Extract text from PDF using PyMuPDF (fitz)
-        with fitz.open(stream=file_content, filetype="pdf") as doc:
-            for page in doc:
-                extracted_text += page.get_text() + "\n"
-
-    elif content_type in [
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        "application/msword",
-    ]:
-        # Extract text from DOCX
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            temp_file.write(file_content)
-            temp_file_path = temp_file.name
-
-        try:
-            doc = Document(temp_file_path)
-            extracted_text = "\n".join([para.text for para in doc.paragraphs])
-        finally:
-            # Clean up the temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-
-    elif content_type == "text/plain":
-        # Already a text file
-        extracted_text = file_content.decode("utf-8")
-
-    else:
+    if content_type not in _RESUME_CONTENT_TYPES:
         raise HTTPException(
             status_code=400, detail=f"Unsupported file type: {content_type}"
         )
+    # Starlette has already spooled the upload (to disk past 1 MB) and knows
+    # its size; refuse oversized files before parsing inflates them further.
+    if file.size is not None and file.size > get_settings().max_resume_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail="Resume file is too large",
+        )
 
-    return extracted_text
+    await file.seek(0)
+    data = await file.read()
+    if content_type == "text/plain":
+        return data.decode("utf-8")
+
+    # PyMuPDF and python-docx are CPU-bound and hold the GIL, so parse in a
+    # separate process: concurrent uploads run in parallel and a pathological
+    # file cannot stall the event loop or other requests' threads.
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_resume_parse_pool(), resume_text.extract_text, content_type, data
+    )
 
 
 # --- User Profile Endpoints (Assuming user_id=1 for PoC) ---
@@ -262,50 +307,116 @@ def create_or_update_profile_endpoint(
     db: Session = Depends(get_db),
 ):
     user_id = current_user.id
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = db.get(models.User, user_id)
     if not user:
         user = crud.create_user(db=db, user=schemas.UserCreate(email=current_user.email, cognito_sub=current_user.email))
     crud.create_or_update_user_profile(db=db, user_id=user_id, profile=profile)
-    profile_json_str = crud.get_user_profile(db=db, user_id=user_id)
-    profile_data = json.loads(profile_json_str)
+    # Echo the submitted dict rather than re-reading and re-parsing the JSON
+    # string that was just stored.
     return schemas.UserProfile(
-        id=user_id, owner_email=user.email, profile_data=profile_data
+        id=user_id, owner_email=user.email, profile_data=profile.profile_data
     )
 
 
-@app.post("/resume/upload", tags=["User Profile"])
+async def parse_resume_in_background(
+    user_id: int,
+    resume_text: str,
+    manager_override: Union[ConnectionManager, None] = None,
+    db_session_override: Union[Session, None] = None,
+):
+    """Parse resume text with the LLM, save it as the user's profile and
+    report the outcome over SSE. Can use an override session for testing."""
+    _manager = manager_override or manager
+    db_session = db_session_override or SessionLocal()
+    try:
+        profile_data = await logic.parse_resume_with_llm(resume_text)
+        profile = schemas.UserProfileCreate(profile_data=profile_data)
+        if crud.create_or_update_user_profile(db=db_session, user_id=user_id, profile=profile) is None:
+            raise LookupError(f"User {user_id} not found")
+        logger.info("BG Task: Resume parsed and profile saved", user_id=user_id)
+        await _manager.send_personal_message(
+            {"status": "parsed", "profile_data": profile_data},
+            user_id,
+            event="profile_updated",
+        )
+    except Exception:
+        logger.exception("BG Task: Failed to parse resume", user_id=user_id)
+        await _manager.send_personal_message(
+            {"error": "resume_parse_failed", "message": "Failed to parse resume"},
+            user_id,
+            event="profile_error",
+        )
+    finally:
+        if db_session_override is None:
+            db_session.close()
+
+
+# Slack for the multipart boundaries and part headers around the file itself.
+_RESUME_UPLOAD_OVERHEAD_BYTES = 64 * 1024
+
+
+@app.middleware("http")
+async def reject_oversized_resume_upload(request: Request, call_next):
+    """Refuse resume uploads whose declared size is over the limit.
+
+    FastAPI reads the whole multipart body before the endpoint runs, so the
+    file.size check in extract_text_from_resume only fires once the upload
+    has been received and spooled. Checking Content-Length here turns honest
+    clients away before any of the body is read.
+    """
+    if request.url.path == "/resume/upload" and request.method == "POST":
+        content_length = request.headers.get("content-length")
+        limit = get_settings().max_resume_bytes + _RESUME_UPLOAD_OVERHEAD_BYTES
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            return JSONResponse(status_code=413, content={"detail": "Resume file is too large"})
+    return await call_next(request)
+
+
+@app.post("/resume/upload", status_code=status.HTTP_202_ACCEPTED, tags=["User Profile"])
 async def upload_resume_endpoint(
+    background_tasks: BackgroundTasks,
     resume: UploadFile = File(...),
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db),
 ):
+    """Extract the resume's text, then parse it into the profile in the
+    background; the result arrives as a `profile_updated` or `profile_error`
+    SSE event."""
     user_id = current_user.id
     resume_text = await extract_text_from_resume(resume)
     if not resume_text.strip():
         raise HTTPException(
             status_code=400, detail="Could not extract text from the resume"
         )
-    profile_data = await logic.parse_resume_with_llm(resume_text)
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user:
-        user = crud.create_user(db=db, user=schemas.UserCreate(email=current_user.email, cognito_sub=current_user.email))
-    profile = schemas.UserProfileCreate(profile_data=profile_data)
-    crud.create_or_update_user_profile(db=db, user_id=user_id, profile=profile)
-    response_data = {
-        "id": user_id,
-        "owner_email": user.email,
-        "profile_data": profile_data,
-    }
-    return JSONResponse(content=response_data)
+    background_tasks.add_task(parse_resume_in_background, user_id, resume_text)
+    return {"status": "accepted"}
+
+
+def _profile_etag(email: str, profile_json: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(email.encode())
+    digest.update(b"\0")
+    digest.update(profile_json.encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return etag in (
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    )
 
 
 @app.get("/profile/", response_model=schemas.UserProfile, tags=["User Profile"])
 def get_profile_endpoint(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     user_id = current_user.id
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = db.get(models.User, user_id)
     if not user:
         return Response(
             status_code=204, headers={"X-Profile-Status": "no_user_found"}
@@ -316,18 +427,37 @@ def get_profile_endpoint(
             status_code=204, headers={"X-Profile-Status": "no_profile_found"}
         )
 
-    profile_data = json.loads(profile_json_str)
-    profile = schemas.UserProfile(id=user_id, owner_email=user.email, profile_data=profile_data)
-    return JSONResponse(content=profile.model_dump())
+    # The stored JSON string is the profile's version: clients revalidating
+    # an unchanged profile get a 304 without it being parsed or serialized.
+    etag = _profile_etag(user.email, profile_json_str)
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    # crud stores the profile dict as compact JSON, so splice it into the
+    # response as-is rather than parsing it only to serialize it again.
+    if profile_json_str.startswith("{"):
+        body = b'{"id":%d,"owner_email":%s,"profile_data":%s}' % (
+            user_id,
+            orjson.dumps(user.email),
+            profile_json_str.encode(),
+        )
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    response.headers.update(headers)
+    profile_data = orjson.loads(profile_json_str)
+    return schemas.UserProfile(id=user_id, owner_email=user.email, profile_data=profile_data)
 
 
 @app.get("/jobs/", response_model=List[schemas.Job], tags=["Jobs"])
 def get_jobs_endpoint(
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     user_id = current_user.id
-    jobs = crud.get_jobs_for_user(db=db, user_id=user_id)
+    jobs = crud.get_jobs_for_user(db=db, user_id=user_id, limit=limit, offset=offset)
     return jobs
 
 
@@ -339,18 +469,9 @@ def get_job_endpoint(
 ):
     user_id = current_user.id
     job = crud.get_job(db=db, job_id=job_id, user_id=user_id)
-    return JSONResponse(
-        content={
-            "id": job.id,
-            "title": job.title,
-            "company": job.company,
-            "description": job.description,
-            "owner_id": job.owner_id,
-            "ranking_score": getattr(job, "ranking_score", None),
-            "ranking_explanation": getattr(job, "ranking_explanation", None),
-            "tailoring_suggestions": getattr(job, "tailoring_suggestions", None),
-        }
-    )
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
 @app.delete("/jobs/{job_id}", tags=["Jobs"])
@@ -405,10 +526,26 @@ async def process_job_in_background(
             )
             return
 
+        # Read the profile once for both ranking and tailoring; the commits
+        # below expire `user`, which would otherwise mean reloading it.
+        profile_text = user.profile_json
+
         # --- 1. Clean up the job description --- #
         cleaned_data: schemas.CleanedJobDescription = await logic.clean_job_description(markdown_content)
 
-        # --- 2. Create initial job record (no score yet) --- #
+        # --- 2. Rank before touching the DB so the job is inserted with its score in one commit --- #
+        # A ranking failure must not lose the job: it is saved unscored and
+        # can be re-ranked later through /jobs/{id}/rank.
+        logger.info("BG: ranking job")
+        try:
+            score, explanation = await logic.rank_job_description(
+                cleaned_data.cleaned_markdown, profile_text
+            )
+        except Exception:
+            logger.exception("BG: ranking failed", user_id=user_id)
+            score, explanation = None, None
+
+        # --- 3. Create the job record with its ranking --- #
         db_job = crud.create_job(
             db=db_session,
             user_id=user_id,
@@ -416,14 +553,17 @@ async def process_job_in_background(
                 title=cleaned_data.title,
                 company=cleaned_data.company,
                 description=cleaned_data.cleaned_markdown,
+                ranking_score=score,
+                ranking_explanation=explanation,
             ),
         )
         db_session.commit()
         db_session.refresh(db_job)
         job_id = db_job.id
         metrics.set_property("job_id", job_id)
+        logger.info("BG: created job", job_id=job_id, score=score)
 
-        # --- 2a. Send initial 'job_created' SSE immediately so UI can render pending card --- #
+        # --- 3a. Send 'job_created' plus 'job_ranked' (or the ranking error) so the UI can render the card --- #
         initial_job_data = {
             "id": db_job.id,
             "title": db_job.title,
@@ -432,26 +572,13 @@ async def process_job_in_background(
             "owner_id": user_id,
         }
         await _manager.send_personal_message(initial_job_data, user_id, event="job_created")
-
-        # --- 3. Rank job now that ID exists --- #
-        logger.info("BG: ranking job")
-        score, explanation = await logic.rank_job_with_llm(
-            db=db_session, job_id=db_job.id, user_id=user_id
-        )
         if score is not None:
-            db_job.ranking_score = score
-            db_job.ranking_explanation = explanation
-            db_session.commit()
-            logger.info(f"BG: updated job {job_id} with ranking score {score}")
-
-            # --- Send 'job_ranked' SSE so UI can update score/explanation incrementally --- #
             await _manager.send_personal_message(
                 {"job_id": job_id, "score": score, "explanation": explanation},
                 user_id,
                 event="job_ranked",
             )
         else:
-            logger.warning("BG: ranking failed", job_id=job_id)
             await _manager.send_personal_message(
                 {
                     "job_id": job_id,
@@ -482,9 +609,11 @@ async def process_job_in_background(
                 # For now, log and continue to tailoring, but credit won't be deducted.
         
         # --- Generate Tailoring Suggestions ---
-        logger.info(f"BG Task: Generating tailoring suggestions for job {job_id}")
+        logger.info("BG Task: Generating tailoring suggestions", job_id=job_id)
         try:
-            suggestions = await logic.generate_tailoring_suggestions(job=db_job, db=db_session)
+            suggestions = await logic.generate_tailoring_suggestions(
+                job=db_job, db=db_session, profile_text=profile_text
+            )
             if suggestions:
                 db_job.tailoring_suggestions = suggestions
                 await _manager.send_personal_message(
@@ -492,13 +621,13 @@ async def process_job_in_background(
                     user_id, event="job_tailored"
                 )
             else:
-                logger.warning(f"BG Task: Tailoring suggestions failed or returned empty for job {job_id}")
+                logger.warning("BG Task: Tailoring suggestions failed or returned empty", job_id=job_id)
                 await _manager.send_personal_message(
                     {"job_id": job_id, "error": "tailoring_failed", "message": "Failed to generate tailoring suggestions (returned empty)."},
                     user_id, event="job_error"
                 )
         except Exception as e_tailor:
-            logger.error(f"BG Task: Exception during tailoring suggestions for job {job_id}: {e_tailor}", exc_info=True)
+            logger.exception("BG Task: Exception during tailoring suggestions", job_id=job_id)
             await _manager.send_personal_message(
                 {"job_id": job_id, "error": "tailoring_exception", "message": f"An error occurred during tailoring: {str(e_tailor)}"},
                 user_id, event="job_error"
@@ -508,9 +637,9 @@ async def process_job_in_background(
         try:
             db_session.commit()
             metrics.put_metric("jobs_completed", 1, "Count") # This seems like a good place for successful completion metric
-            logger.info(f"BG Task: Final updates (tailoring, credits) committed for job {job_id}")
-        except Exception as e_commit_final:
-            logger.error(f"BG Task: Failed to commit final updates for job {job_id}: {e_commit_final}", exc_info=True)
+            logger.info("BG Task: Final updates (tailoring, credits) committed", job_id=job_id)
+        except Exception:
+            logger.exception("BG Task: Failed to commit final updates", job_id=job_id)
             db_session.rollback()
             # Potentially send another error SSE if this commit fails
         
@@ -587,7 +716,6 @@ async def rank_job_endpoint(
     return {"score": score, "explanation": explanation}
 
 
-@app.post("/jobs/from_extension")
 @app.post("/jobs/from_extension", response_model=schemas.Job)
 async def create_job_from_extension(
     job_input: schemas.JobContentInput = Body(...),
@@ -605,12 +733,16 @@ async def create_job_from_extension(
         description=cleaned_job_data.cleaned_markdown,
     )
     job = crud.create_job(db, job=job_create, user_id=current_user.id)
+    # Snapshot before committing: the flush already assigned the id, and the
+    # commit expires the instance, which would cost a SELECT to reload it.
+    job_out = schemas.Job.model_validate(job)
+    db.commit()
     await manager.send_personal_message(
-        schemas.Job.model_validate(job).model_dump(),
+        job_out.model_dump(),
         current_user.id,
         event="job_created",
     )
-    return job
+    return job_out
 
 # --- Stripe Checkout Session endpoint
 @app.post("/billing/checkout-session", tags=["Billing"])
@@ -706,14 +838,14 @@ async def stripe_webhook(
             logger.info(f"Successfully added 50 credits to user {user_id}. New balance: {user.credits}")
         else:
             logger.warning(f"User {user_id} not found in DB; skipping credit grant but returning success.")
-            return JSONResponse(content={"status": "success"}, status_code=200)
+            return ORJSONResponse(content={"status": "success"}, status_code=200)
     else:
         # Unhandled event type (return 200 OK to Stripe)
         logger.info(f"Stripe Webhook: Received unhandled event type {event_type}")
 
     # If we reach here, event was handled or ignored gracefully.
     logger.info(f"Webhook processing finished successfully for event ID {event_id}")
-    return JSONResponse(content={"status": "success"}, status_code=200)
+    return ORJSONResponse(content={"status": "success"}, status_code=200)
 
 
 # --- SSE Endpoint --- #
@@ -29,3 +29,16 @@ class Job(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now()) # Re-add created_at
 
     owner = relationship("User", back_populates="jobs", foreign_keys=[owner_id]) # Use standard relationship
+
+
+class LLMResponseCache(Base):
+    """Persisted LLM responses, keyed by llm_cache's argument hash.
+
+    The second tier of `llm_cache.cache_llm_response(persist=True)`: shared
+    across users, jobs and workers, and survives restarts.
+    """
+    __tablename__ = "llm_response_cache"
+
+    key = Column(String(32), primary_key=True)
+    response_json = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -34,6 +34,9 @@ def _setup_logging() -> None:
 
     # Define shared processors
     shared_processors: list[structlog.types.Processor] = [
+        # Drop events below LOG_LEVEL before any other processor runs, so
+        # disabled debug/info calls don't pay for timestamps and rendering.
+        structlog.stdlib.filter_by_level,
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
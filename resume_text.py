@@ -0,0 +1,29 @@
+"""Text extraction for uploaded resumes.
+
+Kept free of app imports so it can run in the worker processes main.py
+spawns for parsing.
+"""
+import io
+
+import fitz
+from docx import Document
+
+PDF_CONTENT_TYPE = "application/pdf"
+DOCX_CONTENT_TYPES = {
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/msword",
+}
+
+
+def extract_text(content_type: str, data: bytes) -> str:
+    """Synchronously extract text from the raw bytes of a PDF or DOCX resume."""
+    if content_type == PDF_CONTENT_TYPE:
+        # Extract text from PDF using PyMuPDF (fitz)
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            return "".join(page.get_text() + "\n" for page in doc)
+
+    if content_type in DOCX_CONTENT_TYPES:
+        doc = Document(io.BytesIO(data))
+        return "\n".join([para.text for para in doc.paragraphs])
+
+    return ""
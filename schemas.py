@@ -135,7 +135,10 @@ class ResumeData(BaseModel):
 # --- Pydantic Model for Job Ranking --- #
 class JobRanking(BaseModel):
     score: float = Field(
-        ..., description="A score between 0.0 and 10.0 indicating job fit."
+        ...,
+        ge=0.0,
+        le=10.0,
+        description="A score between 0.0 and 10.0 indicating job fit.",
     )
     explanation: str = Field(
         ..., description="A brief explanation of the ranking score."
@@ -23,9 +23,25 @@ class Settings(BaseSettings):
     # Toggle for authentication and billing (default: enabled)
     auth_billing_enabled: bool = True
 
+    # Create missing DB tables at startup; disable when migrations own the schema
+    init_db: bool = True
+
     # Application base URL (for constructing callback URLs etc.)
     app_base_url: str = "http://localhost:8000"  # Default for local dev
 
+    # OpenRouter request limits. Concurrency is capped per model so bursts
+    # queue locally instead of tripping rate limits; rate-limited and failed
+    # requests are retried by the OpenAI SDK with exponential backoff.
+    llm_max_concurrent_requests_per_model: int = 8
+    llm_max_retries: int = 3
+
+    # Largest accepted resume upload; bigger files are rejected before parsing
+    max_resume_bytes: int = 10 * 1024 * 1024
+
+    # In-process LLM response cache (LRU, entries expire after the TTL)
+    llm_cache_max_entries: int = 10_000
+    llm_cache_ttl_seconds: int = 24 * 3600
+
 
 @lru_cache()
 def get_settings() -> Settings:
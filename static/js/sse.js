@@ -151,6 +151,17 @@ function connectToSSE(userId = window.currentUserId) {
     showToast(`Error processing job ${eventData.job_id}: ${eventData.message}`, 'error');
   });
 
+  eventSource.addEventListener("profile_updated", function(event) {
+    console.log("SSE: Received profile_updated");
+    if (typeof window.handleResumeParsed === 'function') window.handleResumeParsed();
+  });
+
+  eventSource.addEventListener("profile_error", function(event) {
+    const eventData = JSON.parse(event.data);
+    console.error("SSE: Received profile_error", eventData);
+    if (typeof window.handleResumeParseError === 'function') window.handleResumeParseError(eventData.message);
+  });
+
   eventSource.addEventListener("processing_count_update", function (event) {
     const data = JSON.parse(event.data);
     console.log("SSE: Received processing_count_update", data);
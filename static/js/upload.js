@@ -3,6 +3,56 @@
  * Handles resume file uploads and processing
  */
 
+// How long to wait for a background resume parse before giving up
+const RESUME_PARSE_TIMEOUT_MS = 120000;
+
+// State of the resume parse currently awaited, or null
+let pendingResumeParse = null;
+
+// Current profile ETag, or null when there is no profile yet
+async function fetchProfileEtag() {
+  const response = await fetch(`/profile/`, {
+    headers: await window.authHeaders(),
+    cache: "no-cache",
+  });
+  return response.status === 200 ? response.headers.get("ETag") : null;
+}
+
+// The parse result is announced over SSE, but events are dropped while the
+// stream is reconnecting, replaced by another tab or backed up. Poll the
+// profile as well (cheap thanks to its ETag) until it changes or we time out.
+function watchResumeParse(previousEtag) {
+  const parse = { deadline: Date.now() + RESUME_PARSE_TIMEOUT_MS, timer: null };
+  pendingResumeParse = parse;
+
+  const poll = async (delay) => {
+    try {
+      const etag = await fetchProfileEtag();
+      if (pendingResumeParse !== parse) return; // Settled meanwhile (e.g. via SSE)
+      if (etag && etag !== previousEtag) {
+        handleResumeParsed();
+        return;
+      }
+    } catch (error) {
+      console.warn("Polling profile after resume upload failed:", error);
+    }
+    if (pendingResumeParse !== parse) return;
+    if (Date.now() >= parse.deadline) {
+      handleResumeParseTimeout();
+      return;
+    }
+    parse.timer = setTimeout(() => poll(Math.min(delay * 2, 15000)), delay);
+  };
+  parse.timer = setTimeout(() => poll(2000), 2000);
+}
+
+function stopWatchingResumeParse() {
+  if (pendingResumeParse) {
+    clearTimeout(pendingResumeParse.timer);
+    pendingResumeParse = null;
+  }
+}
+
 // Function to upload the resume file
 async function uploadResumeFile() {
   console.log("Uploading resume file...");
@@ -12,8 +62,6 @@ async function uploadResumeFile() {
   const uploadContent = document.getElementById("uploadContent");
   const uploadSpinner = document.getElementById("uploadSpinner");
   const uploadArea = document.getElementById("uploadArea");
-  const resumeUploadContainer = document.getElementById("resumeUploadContainer");
-  const resetProfileContainer = document.getElementById("profileActions");
 
   if (!file) {
     showToast('Please select a file to upload.', 'warning');
@@ -42,6 +90,9 @@ async function uploadResumeFile() {
     // Use current user id from global set by auth.js
     const userId = window.currentUserId;
 
+    // Remember the current profile version so polling can tell when it changes
+    const previousEtag = await fetchProfileEtag().catch(() => null);
+
     // Create form data
     const formData = new FormData();
     formData.append("resume", file);
@@ -59,35 +110,95 @@ async function uploadResumeFile() {
       throw new Error(errorData.detail || `HTTP error! status: ${response.status}`);
     }
 
-    const data = await response.json();
-    console.log("Resume processed successfully:", data);
-    showToast('Resume processed successfully!', 'success');
-
-    // Hide upload container, show reset button
-    if (resumeUploadContainer) {
-      resumeUploadContainer.style.display = "none";
-    }
-    if (resetProfileContainer) {
-      resetProfileContainer.style.display = "block";
+    // The server parses the resume in the background and reports the result
+    // over SSE (profile_updated / profile_error); keep the spinner until then.
+    console.log("Resume accepted for parsing");
+    if (uploadStatusElement) {
+      uploadStatusElement.textContent = 'Parsing your resume...';
     }
-
-    // Fetch and display the profile
-    await loadProfile();
+    watchResumeParse(previousEtag);
   } catch (error) {
     console.error("Error uploading resume:", error);
+    handleResumeParseError(error.message);
+  }
+}
 
-    // Restore the upload area
-    if (uploadArea) {
-      if (uploadContent) uploadContent.classList.remove("hidden");
-      if (uploadSpinner) uploadSpinner.classList.add("hidden");
-      uploadArea.classList.add("hover:border-indigo-600", "hover:bg-indigo-100"); // Re-enable hover effect
-    }
+// Called by sse.js or the profile poll once the uploaded resume has been
+// parsed into the profile
+async function handleResumeParsed() {
+  if (!pendingResumeParse) {
+    // Already handled, or the upload came from another tab: just refresh
+    await loadProfile();
+    return;
+  }
+  stopWatchingResumeParse();
+
+  const uploadStatusElement = document.getElementById("uploadStatus");
+  const resumeUploadContainer = document.getElementById("resumeUploadContainer");
+  const resetProfileContainer = document.getElementById("profileActions");
 
-    // Show error message
-    showToast(`Error processing resume: ${error.message}`, 'error');
+  showToast('Resume processed successfully!', 'success');
+  if (uploadStatusElement) {
+    uploadStatusElement.textContent = '';
   }
+
+  // Hide upload container, show reset button
+  if (resumeUploadContainer) {
+    resumeUploadContainer.style.display = "none";
+  }
+  if (resetProfileContainer) {
+    resetProfileContainer.style.display = "block";
+  }
+
+  // Fetch and display the profile
+  await loadProfile();
 }
 
+// Called on upload failure, or by sse.js if background parsing fails
+function handleResumeParseError(message) {
+  stopWatchingResumeParse();
+  const uploadStatusElement = document.getElementById("uploadStatus");
+  const uploadContent = document.getElementById("uploadContent");
+  const uploadSpinner = document.getElementById("uploadSpinner");
+  const uploadArea = document.getElementById("uploadArea");
+
+  // Restore the upload area
+  if (uploadArea) {
+    if (uploadContent) uploadContent.classList.remove("hidden");
+    if (uploadSpinner) uploadSpinner.classList.add("hidden");
+    uploadArea.classList.add("hover:border-indigo-600", "hover:bg-indigo-100"); // Re-enable hover effect
+  }
+  if (uploadStatusElement) {
+    uploadStatusElement.textContent = '';
+  }
+
+  // Show error message
+  showToast(`Error processing resume: ${message}`, 'error');
+}
+
+// Neither SSE nor polling saw a result in time; the parse may still finish
+function handleResumeParseTimeout() {
+  stopWatchingResumeParse();
+  const uploadContent = document.getElementById("uploadContent");
+  const uploadSpinner = document.getElementById("uploadSpinner");
+  const uploadArea = document.getElementById("uploadArea");
+  const uploadStatusElement = document.getElementById("uploadStatus");
+
+  if (uploadArea) {
+    if (uploadContent) uploadContent.classList.remove("hidden");
+    if (uploadSpinner) uploadSpinner.classList.add("hidden");
+    uploadArea.classList.add("hover:border-indigo-600", "hover:bg-indigo-100"); // Re-enable hover effect
+  }
+  if (uploadStatusElement) {
+    uploadStatusElement.textContent = '';
+  }
+  showToast('Your resume is taking longer than expected to process. Your profile will appear once it is ready.', 'warning');
+  loadProfile();
+}
+
+window.handleResumeParsed = handleResumeParsed;
+window.handleResumeParseError = handleResumeParseError;
+
 // Function to reset the file upload
 function resetFileUpload() {
   const fileInput = document.getElementById("resumeFile");
@@ -41,7 +41,7 @@ async def test_process_job_insufficient_credits(db_session: Session):
 
     # 2. Act: Call the background task directly with async mocks for logic functions to avoid await issues
     with patch("main.logic.clean_job_description", new_callable=AsyncMock, return_value=schemas.CleanedJobDescription(company="Test Co", title="Tester", location="Remote", cleaned_markdown="# Cleaned MD")) as mock_clean, \
-         patch("main.logic.rank_job_with_llm", new_callable=AsyncMock, return_value=(85, "Good fit")) as mock_rank, \
+         patch("main.logic.rank_job_description", new_callable=AsyncMock, return_value=(85, "Good fit")) as mock_rank, \
          patch("main.logic.generate_tailoring_suggestions", new_callable=AsyncMock, return_value=["Suggestion 1"]) as mock_tailor:
         await process_job_in_background(user.id, markdown_content, mock_manager)
 
@@ -74,7 +74,7 @@ async def test_process_job_sufficient_credits(db_session: Session):
 
     # Mock external calls *within* process_job_in_background with AsyncMock to allow awaiting
     with patch("main.logic.clean_job_description", new_callable=AsyncMock, return_value=schemas.CleanedJobDescription(company="Test Co", title="Tester", location="Remote", cleaned_markdown="# Cleaned MD")) as mock_clean, \
-         patch("main.logic.rank_job_with_llm", new_callable=AsyncMock, return_value=(85, "Good fit")) as mock_rank, \
+         patch("main.logic.rank_job_description", new_callable=AsyncMock, return_value=(85, "Good fit")) as mock_rank, \
          patch("main.logic.generate_tailoring_suggestions", new_callable=AsyncMock, return_value=["Suggestion 1"]) as mock_tailor:
 
         # 2. Act: Call the actual background task function
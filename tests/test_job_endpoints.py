@@ -0,0 +1,38 @@
+from sqlalchemy.orm import Session
+
+import crud
+import models
+import schemas
+from main import app, get_current_user
+
+
+def test_get_job_returns_404_for_missing_or_foreign_job(test_client, db_session: Session):
+    owner = models.User(email="job-owner@example.com", cognito_sub="sub-job-owner")
+    other = models.User(email="job-other@example.com", cognito_sub="sub-job-other")
+    db_session.add_all([owner, other])
+    db_session.commit()
+    job = crud.create_job(
+        db_session,
+        schemas.JobCreate(title="Engineer", company="Acme", description="Build things."),
+        user_id=owner.id,
+    )
+    db_session.commit()
+    try:
+        app.dependency_overrides[get_current_user] = lambda: owner
+        found = test_client.get(f"/jobs/{job.id}")
+        assert found.status_code == 200
+        assert found.json()["title"] == "Engineer"
+
+        missing = test_client.get(f"/jobs/{job.id + 1}")
+        assert missing.status_code == 404
+        assert missing.json() == {"detail": "Job not found"}
+
+        app.dependency_overrides[get_current_user] = lambda: other
+        foreign = test_client.get(f"/jobs/{job.id}")
+        assert foreign.status_code == 404
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+        db_session.delete(job)
+        db_session.delete(owner)
+        db_session.delete(other)
+        db_session.commit()
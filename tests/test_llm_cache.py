@@ -0,0 +1,217 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+import crud
+import llm_cache
+import models
+import schemas
+
+
+@pytest.fixture(autouse=True)
+def clear_llm_cache():
+    """Start every test with an empty LLM response cache."""
+    llm_cache._LLM_CACHE.clear()
+    yield
+    llm_cache._LLM_CACHE.clear()
+
+
+@pytest.mark.asyncio
+async def test_cache_ignores_whitespace_only_differences():
+    """Formatting-only variants of the same text should share one LLM call."""
+    calls = []
+
+    @llm_cache.cache_llm_response
+    async def fake_llm(text: str):
+        calls.append(text)
+        return text.upper()
+
+    await fake_llm("Senior Engineer\n\n  at Acme ")
+    await fake_llm("Senior Engineer at Acme")
+    await fake_llm("Senior Engineer at Acme Corp")
+
+    assert len(calls) == 2
+
+
+def test_cache_key_does_not_collide_across_argument_boundaries():
+    """("ab", "c") and ("a", "bc") must not map to the same cache entry."""
+    assert llm_cache._make_cache_key("f", ("ab", "c"), {}) != llm_cache._make_cache_key(
+        "f", ("a", "bc"), {}
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_llm_request():
+    """Concurrent cache misses for the same key should coalesce (single-flight)."""
+    calls = 0
+    release = asyncio.Event()
+
+    @llm_cache.cache_llm_response
+    async def slow_llm(text: str):
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return f"result for {text}"
+
+    tasks = [asyncio.create_task(slow_llm("same prompt")) for _ in range(5)]
+    await asyncio.sleep(0)  # let every task reach the cache check
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == 1
+    assert results == ["result for same prompt"] * 5
+
+
+@pytest.mark.asyncio
+async def test_inflight_failure_propagates_and_is_not_cached():
+    """Waiters see the leader's exception, and the next call retries."""
+    calls = 0
+    release = asyncio.Event()
+
+    @llm_cache.cache_llm_response
+    async def flaky_llm(text: str):
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        if calls == 1:
+            raise RuntimeError("upstream error")
+        return "ok"
+
+    tasks = [asyncio.create_task(flaky_llm("prompt")) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert await flaky_llm("prompt") == "ok"
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_waiters_retry_when_the_leading_call_is_cancelled():
+    """Cancelling the leader doesn't cancel callers that joined its call."""
+    calls = 0
+    started = asyncio.Event()
+
+    @llm_cache.cache_llm_response
+    async def slow_llm(text: str):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            started.set()
+            await asyncio.sleep(3600)
+        return "ok"
+
+    leader = asyncio.create_task(slow_llm("cancel me"))
+    await started.wait()
+    waiter = asyncio.create_task(slow_llm("cancel me"))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == "ok"
+    assert leader.cancelled()
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded(monkeypatch):
+    """Least recently used entries are evicted once the cache is full."""
+    monkeypatch.setattr(llm_cache, "_LLM_CACHE", llm_cache.TTLCache(maxsize=2, ttl=60))
+    calls = []
+
+    @llm_cache.cache_llm_response
+    async def fake_llm(text: str):
+        calls.append(text)
+        return text
+
+    for text in ("a", "b", "c", "a"):
+        await fake_llm(text)
+
+    assert len(llm_cache._LLM_CACHE) == 2
+    assert calls == ["a", "b", "c", "a"]
+
+
+def test_cache_key_is_canonical_for_structured_arguments():
+    """Dict key order and str-vs-int lookalikes are handled deterministically."""
+    key = llm_cache._make_cache_key
+    assert key("f", ({"a": 1, "b": [1, 2]},), {}) == key("f", ({"b": [1, 2], "a": 1},), {})
+    assert key("f", ("1",), {}) != key("f", (1,), {})
+    # NFC and NFD spellings of "café" are the same text
+    assert key("f", ("caf\u00e9",), {}) == key("f", ("cafe\u0301",), {})
+
+
+def test_cache_key_ignores_database_sessions():
+    """Per-request sessions must not turn every call into a cache miss."""
+    key = llm_cache._make_cache_key
+    assert key("f", (Session(), "text"), {}) == key("f", (Session(), "text"), {})
+
+
+def test_cache_key_changes_with_llm_settings(monkeypatch):
+    """Results cached under other models, options or prompts are not reused."""
+    before = llm_cache._make_cache_key("f", ("text",), {})
+    monkeypatch.setattr(llm_cache.llm_interaction, "COMMON_OPTS", {"seed": 456})
+    monkeypatch.setattr(llm_cache, "CACHE_FINGERPRINT", llm_cache._fingerprint())
+    assert llm_cache._make_cache_key("f", ("text",), {}) != before
+
+
+@pytest.mark.asyncio
+async def test_persisted_responses_survive_a_cleared_memory_cache(db_session, monkeypatch):
+    """With persist=True, a response is served from the DB after a restart."""
+    monkeypatch.setattr(llm_cache, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+    calls = []
+
+    @llm_cache.cache_llm_response(persist=True)
+    async def fake_rank(job_description: str) -> schemas.JobRanking:
+        calls.append(job_description)
+        return schemas.JobRanking(score=8.0, explanation="Strong match")
+
+    first = await fake_rank("Backend role")
+    llm_cache._LLM_CACHE.clear()  # Simulate a restart
+    second = await fake_rank("Backend role")
+
+    assert calls == ["Backend role"]
+    assert second == first
+    db_session.query(models.LLMResponseCache).delete()
+    db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_invalid_persisted_response_is_treated_as_a_miss(db_session, monkeypatch):
+    """A stored row the return model no longer accepts is replaced, not raised."""
+    monkeypatch.setattr(llm_cache, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+
+    @llm_cache.cache_llm_response(persist=True)
+    async def fake_rank(job_description: str) -> schemas.JobRanking:
+        return schemas.JobRanking(score=8.0, explanation="Strong match")
+
+    key = llm_cache._make_cache_key("fake_rank", ("Backend role",), {})
+    crud.save_llm_response(db_session, key, '{"score": 11, "explanation": "Old scale"}')
+
+    result = await fake_rank("Backend role")
+
+    assert result.score == 8.0
+    db_session.expire_all()
+    assert '"score":8.0' in crud.get_llm_response(db_session, key)
+    db_session.query(models.LLMResponseCache).delete()
+    db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_persisted_read_errors_fall_back_to_the_llm(monkeypatch):
+    """A failing DB read is treated as a miss rather than failing the call."""
+    def broken_get(db, key):
+        raise OperationalError("SELECT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(llm_cache.crud, "get_llm_response", broken_get)
+    monkeypatch.setattr(llm_cache, "_store_persisted", lambda key, response_json: None)
+
+    @llm_cache.cache_llm_response(persist=True)
+    async def fake_rank(job_description: str) -> schemas.JobRanking:
+        return schemas.JobRanking(score=7.0, explanation="Decent match")
+
+    result = await fake_rank("Read error role")
+
+    assert result.score == 7.0
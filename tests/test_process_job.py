@@ -0,0 +1,37 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+import crud
+import models
+import schemas
+from main import process_job_in_background
+
+
+@pytest.mark.asyncio
+async def test_process_job_keeps_job_when_ranking_fails(db_session: Session):
+    """A ranking failure should still save the job (unscored) and report the error."""
+    user = models.User(email="rankfail@example.com", cognito_sub="sub-rankfail", credits=5)
+    db_session.add(user)
+    db_session.commit()
+    mock_manager = AsyncMock()
+    cleaned = schemas.CleanedJobDescription(
+        company="Test Co", title="Tester", location="Remote", cleaned_markdown="# Cleaned MD"
+    )
+
+    with patch("main.logic.clean_job_description", new_callable=AsyncMock, return_value=cleaned), \
+         patch("main.logic.rank_job_description", new_callable=AsyncMock, side_effect=RuntimeError("upstream error")), \
+         patch("main.logic.generate_tailoring_suggestions", new_callable=AsyncMock, return_value="Suggestion 1"):
+        await process_job_in_background(user.id, "# Real Job", mock_manager, db_session)
+
+    jobs = crud.get_jobs_for_user(db=db_session, user_id=user.id)
+    assert len(jobs) == 1
+    assert jobs[0].ranking_score is None
+
+    calls = mock_manager.send_personal_message.await_args_list
+    events = [c.kwargs.get("event") for c in calls]
+    assert "job_created" in events
+    assert "job_ranked" not in events
+    errors = [c.args[0] for c in calls if c.kwargs.get("event") == "job_error"]
+    assert any(e.get("error") == "ranking_failed" for e in errors)
@@ -0,0 +1,39 @@
+from sqlalchemy.orm import Session
+
+import crud
+import models
+import schemas
+from main import app, get_current_user
+
+
+def test_profile_endpoint_revalidates_with_etag(test_client, db_session: Session):
+    user = models.User(email="profile-etag@example.com", cognito_sub="sub-profile-etag")
+    db_session.add(user)
+    db_session.commit()
+    crud.create_or_update_user_profile(
+        db_session, user.id, schemas.UserProfileCreate(profile_data={"name": "Ada"})
+    )
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        first = test_client.get("/profile/")
+        assert first.status_code == 200
+        assert first.json() == {
+            "id": user.id,
+            "owner_email": "profile-etag@example.com",
+            "profile_data": {"name": "Ada"},
+        }
+        etag = first.headers["etag"]
+
+        cached = test_client.get("/profile/", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+
+        crud.create_or_update_user_profile(
+            db_session, user.id, schemas.UserProfileCreate(profile_data={"name": "Grace"})
+        )
+        changed = test_client.get("/profile/", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.json()["profile_data"] == {"name": "Grace"}
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+        db_session.delete(user)
+        db_session.commit()
@@ -0,0 +1,92 @@
+import io
+from unittest.mock import AsyncMock, patch
+
+import fitz
+import pytest
+from fastapi import HTTPException, UploadFile
+from sqlalchemy.orm import Session
+from starlette.datastructures import Headers
+
+import crud
+import models
+from main import (
+    app,
+    extract_text_from_resume,
+    get_current_user,
+    get_settings,
+    parse_resume_in_background,
+)
+
+
+def make_upload(content: bytes, content_type: str = "text/plain") -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(content),
+        size=len(content),
+        filename="resume.txt",
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+@pytest.mark.asyncio
+async def test_extracts_plain_text_resume():
+    assert await extract_text_from_resume(make_upload(b"Jane Doe\nEngineer")) == "Jane Doe\nEngineer"
+
+
+@pytest.mark.asyncio
+async def test_rejects_oversized_resume_before_parsing(monkeypatch):
+    monkeypatch.setattr(get_settings(), "max_resume_bytes", 8)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await extract_text_from_resume(make_upload(b"x" * 9))
+
+    assert exc_info.value.status_code == 413
+
+
+def test_upload_rejects_oversized_content_length_before_reading_body(test_client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "max_resume_bytes", 8)
+    app.dependency_overrides[get_current_user] = lambda: models.User(id=1, email="big@example.com")
+    try:
+        with patch("main.extract_text_from_resume", new_callable=AsyncMock) as extract:
+            response = test_client.post(
+                "/resume/upload",
+                files={"resume": ("resume.txt", b"x" * (128 * 1024), "text/plain")},
+            )
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    assert response.status_code == 413
+    extract.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_extracts_pdf_resume_in_worker_process():
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Jane Doe")
+    upload = make_upload(doc.tobytes(), content_type="application/pdf")
+
+    assert (await extract_text_from_resume(upload)).strip() == "Jane Doe"
+
+
+@pytest.mark.asyncio
+async def test_background_parse_saves_profile_and_notifies(db_session: Session):
+    user = models.User(email="resume-bg@example.com", cognito_sub="sub-resume-bg")
+    db_session.add(user)
+    db_session.commit()
+    mock_manager = AsyncMock()
+
+    with patch(
+        "main.logic.parse_resume_with_llm",
+        new_callable=AsyncMock,
+        return_value={"name": "Jane Doe"},
+    ):
+        await parse_resume_in_background(user.id, "Jane Doe", mock_manager, db_session)
+
+    assert crud.get_user_profile(db_session, user.id) == '{"name":"Jane Doe"}'
+    mock_manager.send_personal_message.assert_awaited_once_with(
+        {"status": "parsed", "profile_data": {"name": "Jane Doe"}},
+        user.id,
+        event="profile_updated",
+    )
+
+    db_session.delete(user)
+    db_session.commit()